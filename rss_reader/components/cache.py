@@ -6,6 +6,7 @@ import imghdr
 import json
 import os
 import sys
+import threading
 import urllib.request
 
 from components.feed import Feed
@@ -26,45 +27,68 @@ class Cache:
         self.logger = logger
         self.cache_folder_path = cache_folder_path
         self.cache_images_folder_path = self.cache_folder_path + 'images' + os.path.sep
+        self.cached_feeds_file_path = self.cache_folder_path + 'feeds.json'
+        self.__buffer = []
+        self.__lock = threading.Lock()
         if not os.path.exists(self.cache_images_folder_path):
             os.makedirs(self.cache_images_folder_path)
 
-    def cache_news(self, news):
+    def cache_news(self, news, defer=False):
         """
         This method prepares data and writing it to the cache file
 
         Parameters:
             news (News): Object of class News
+            defer (bool): If True news is only buffered and written to the cache file by the flush method
         """
-        cache_date = datetime.strftime(news.date, "%Y%m%d")
-        cache_file_path = f'{self.cache_folder_path}{cache_date}.json'
-        news_already_cached = False
-        cached_data = self.__get_cached_data(cache_file_path)
-        if cached_data:
-            cached_feeds_sources = tuple((cached_feed['source'] for cached_feed in cached_data.values()))
-            if news.source_url in cached_feeds_sources:
-                source_feed_index = str(cached_feeds_sources.index(news.source_url))
-                cached_news_links = tuple(
-                    cached_news['url'] for cached_news in cached_data[source_feed_index]['items'].values())
-                if news.link in cached_news_links:
-                    news_already_cached = True
-                else:
-                    cached_data[source_feed_index]['items'][len(cached_news_links)] = news.to_dict()
-            else:
-                cached_data[len(cached_data)] = {'title': news.feed_title,
-                                                 'source': news.source_url,
-                                                 'items': {
-                                                     0: news.to_dict()
-                                                 }}
+        with self.__lock:
+            self.__buffer.append(news)
+        if not defer:
+            self.flush()
+
+    def flush(self):
+        """This method writes all buffered news to the cache files, each file is written once"""
+        with self.__lock:
+            news_by_cache_date = {}
+            for news in self.__buffer:
+                news_by_cache_date.setdefault(datetime.strftime(news.date, "%Y%m%d"), []).append(news)
+            self.__buffer = []
+            for cache_date, cache_date_news_list in news_by_cache_date.items():
+                cache_file_path = f'{self.cache_folder_path}{cache_date}.json'
+                cached_data = self.__get_cached_data(cache_file_path) or {}
+                new_news_list = [news for news in cache_date_news_list if self.__add_news(cached_data, news)]
+                if new_news_list:
+                    self.__write_cache(cache_file_path, cached_data)
+                    for news in new_news_list:
+                        self.__cache_images(news)
+
+    @staticmethod
+    def __add_news(cached_data, news) -> bool:
+        """
+        This method adds news to the cached data if it is not already there
+
+        Parameters:
+            cached_data (dict): Dictionary that contain cached feed
+            news (News): Object of class News
+
+        Returns:
+            bool: True if news was added, False if it is already cached
+        """
+        cached_feeds_sources = tuple((cached_feed['source'] for cached_feed in cached_data.values()))
+        if news.source_url in cached_feeds_sources:
+            source_feed_index = str(cached_feeds_sources.index(news.source_url))
+            cached_news_links = tuple(
+                cached_news['url'] for cached_news in cached_data[source_feed_index]['items'].values())
+            if news.link in cached_news_links:
+                return False
+            cached_data[source_feed_index]['items'][str(len(cached_news_links))] = news.to_dict()
         else:
-            cached_data = {0: {'title': news.feed_title,
-                               'source': news.source_url,
-                               'items': {
-                                   0: news.to_dict()
-                               }}}
-        if not news_already_cached:
-            self.__write_cache(cache_file_path, cached_data)
-            self.__cache_images(news)
+            cached_data[str(len(cached_data))] = {'title': news.feed_title,
+                                                  'source': news.source_url,
+                                                  'items': {
+                                                      '0': news.to_dict()
+                                                  }}
+        return True
 
     def __get_cached_data(self, cache_file_path):
         """
@@ -146,6 +170,68 @@ class Cache:
             self.logger.error(f'No cached news found with published date {date_object.date()}')
             sys.exit()
 
+    def cache_feed(self, feed, response_headers):
+        """
+        This method saves the feed news together with the validators of the response (ETag and Last-Modified)
+        so that the next request of the feed can be conditional
+
+        Parameters:
+            feed (Feed): Object of class Feed
+            response_headers (dict): Headers of the response containing the feed
+        """
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if etag or last_modified:
+            with self.__lock:
+                cached_feeds = self.__get_cached_data(self.cached_feeds_file_path) or {}
+                cached_feeds[feed.source_url] = {'title': feed.feed_title,
+                                                 'etag': etag,
+                                                 'last_modified': last_modified,
+                                                 'items': [news.to_dict() for news in feed.news_list]}
+                self.__write_cache(self.cached_feeds_file_path, cached_feeds)
+
+    def get_feed_validators(self, source_url) -> dict:
+        """
+        This method returns the conditional request headers for the feed saved by the cache_feed method
+
+        Parameters:
+            source_url (str): Link to RSS Feed
+
+        Returns:
+            dict: Dictionary with If-None-Match and If-Modified-Since headers (empty if the feed was not saved)
+        """
+        cached_feed = (self.__get_cached_data(self.cached_feeds_file_path) or {}).get(source_url)
+        headers = {}
+        if cached_feed:
+            if cached_feed['etag']:
+                headers['If-None-Match'] = cached_feed['etag']
+            if cached_feed['last_modified']:
+                headers['If-Modified-Since'] = cached_feed['last_modified']
+        return headers
+
+    def get_cached_feed(self, source_url, news_limit, to_json, to_colorized_format) -> Feed:
+        """
+        This method creates feed from the news saved by the cache_feed method
+
+        Parameters:
+            source_url (str): Link to RSS Feed
+            news_limit (int or NoneType): Value that limits the number of news
+            to_json (bool): If True news will be printed in JSON format
+            to_colorized_format (bool): If True colors the result
+
+        Returns:
+            Feed: Object of class Feed
+            None: If no news of the feed were saved
+        """
+        self.logger.info('Getting feed news from cache')
+        cached_feed = (self.__get_cached_data(self.cached_feeds_file_path) or {}).get(source_url)
+        if not cached_feed or not cached_feed['items']:
+            return None
+        news_list = [News(cached_feed['title'], cached_news, source_url, self.logger, self, to_colorized_format)
+                     for cached_news in cached_feed['items']]
+        return Feed(source_url, news_limit, to_json, to_colorized_format, self.logger, cached_feed['title'], self,
+                    news_list=news_list)
+
     def __cache_images(self, news):
         """
         This method downloads images from URL and saves them
@@ -153,7 +239,7 @@ class Cache:
         Parameters:
             news (News): Object of class News
         """
-        for link_index, link in news.links.items():
+        for link_index, link in enumerate(news.links):
             if 'image' in link['type']:
                 cached_image_filename = f'{hashlib.md5(news.link.encode()).hexdigest()}_{link_index}'
                 cached_image_file_path = self.cache_images_folder_path + cached_image_filename
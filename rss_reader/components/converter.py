@@ -160,7 +160,7 @@ class Converter:
         images = list(re.finditer(r'\[image \d: .+\]', news.description))
         for image in images:
             news_description += news.description[temp_index:image.start()].strip()
-            image_index = re.search(r' \d:', image.string).group(0)[1:2]
+            image_index = int(re.search(r' \d:', image.string).group(0)[1:2])
             cached_image_filename = f'{hashlib.md5(news.link.encode()).hexdigest()}_{image_index}'
             cached_image_file_path = self.__get_image(news.links[image_index]['url'], cached_image_filename)
             if cached_image_file_path:
@@ -185,7 +185,7 @@ class Converter:
         """
         news_enclosure_html = ''
         enclosure_indexes_list = []
-        for link_index, link in news.links.items():
+        for link_index, link in enumerate(news.links):
             if link['enclosure']:
                 enclosure_indexes_list.append(link_index)
         if enclosure_indexes_list:
@@ -204,7 +204,7 @@ class Converter:
         """
         news_media_content_html = ''
         media_content_indexes_list = []
-        for link_index, link in news.links.items():
+        for link_index, link in enumerate(news.links):
             if link['media']:
                 media_content_indexes_list.append(link_index)
         if media_content_indexes_list:
@@ -46,9 +46,8 @@ class Feed:
 
     def __create_feed(self):
         """This method creates news objects and adds them to the news list"""
-        for news_item in self.news_items:
-            self.news_list.append(
-                News(self.feed_title, news_item, self.source_url, self.logger, self.cache, self.to_colorized_format))
+        self.news_list.extend(News.build_many(self.feed_title, self.news_items, self.source_url, self.logger,
+                                              self.cache, self.to_colorized_format))
 
     def __str__(self) -> str:
         """This method override default __str__ method which computes the string representation of an object"""
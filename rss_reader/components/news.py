@@ -1,15 +1,59 @@
 """This module contains a class that represents a feed item"""
 
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+import html
+import mimetypes
+import re
+import threading
+from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
 from dateutil.parser import parse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DATE_FORMAT = '%a, %d %b %G %X'
+HEAD_TIMEOUT = (2, 3)
+IMAGE_TAG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+NOT_IMAGE_TAG_PATTERN = re.compile(r'<(?!img\b)[a-z/!?]', re.IGNORECASE)
+ATTRIBUTE_PATTERN = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+
+
+def create_session() -> requests.Session:
+    """
+    This function creates a session that keeps connections alive and reuses them between requests
+
+    Returns:
+        requests.Session: Session with a connection pool mounted for HTTP and HTTPS
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64,
+                          max_retries=Retry(total=2, connect=0, read=0, backoff_factor=0.2))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
 
 
 class News:
     """This class represents a feed item"""
 
+    __slots__ = ('feed_title', 'item', 'source_url', 'logger', 'cache', 'to_colorized_format', 'links', 'title', 'link',
+                 'description', 'date', '_formatted_date', '_rendered')
+    _COLORS = {'cyan': '\033[1;36m', 'yellow': '\033[1;33m', 'red': '\033[1;31m'}
+    _COLOR_RESET = '\033[0m'
+    _session = create_session()
+    _executor = ThreadPoolExecutor(max_workers=8)
+    _content_type_requests = {}
+    _content_type_requests_lock = threading.Lock()
+    _warm_up_executor = ThreadPoolExecutor(max_workers=4)
+    _warmed_up_hosts = set()
+    _warmed_up_hosts_lock = threading.Lock()
+
     def __init__(self, feed_title, item, source_url, logger, cache, to_colorized_format):
         """
         This class constructor initializes the required variables for the news class
@@ -28,44 +72,184 @@ class News:
         self.logger = logger
         self.cache = cache
         self.to_colorized_format = to_colorized_format
+        self._formatted_date = None
+        self._rendered = None
         if isinstance(self.item, dict):
             self.__from_cache()
         else:
-            self.links = {}
+            self.links = []
             self.title = self.item.title.text
             self.link = self.item.link.text
             self.description = self.__parse_description()
             self.date = self.__parse_date()
-            self.formatted_date = datetime.strftime(self.date, '%a, %d %b %G %X')
-            self.__parse_enclosure()
-            self.__parse_media_content()
-            self.cache.cache_news(self)
+            self.__parse_attachments()
+            self.__resolve_content_types()
+            self.cache.cache_news(self, defer=True)
+
+    @classmethod
+    def build_many(cls, feed_title, items, source_url, logger, cache, to_colorized_format) -> list:
+        """
+        This method creates news objects from feed items concurrently
+
+        Parameters:
+            feed_title (str): News feed title
+            items (bs4.element.ResultSet): Object of class bs4.element.ResultSet containing news items
+            source_url (str): Link to RSS Feed
+            logger (module): logging module
+            cache (Cache): Object of class Cache
+            to_colorized_format (bool): If True colors the result
+
+        Returns:
+            list: List of objects of class News in the order of the feed items
+        """
+        if not items:
+            return []
+        max_workers = min(8, len(items))
+        cls.__warm_up_connections(items[max_workers:])
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda item: cls(feed_title, item, source_url, logger, cache, to_colorized_format), items))
+
+    @classmethod
+    def __warm_up_connections(cls, items):
+        """
+        This method opens connections in the background to the hosts that will be probed for the content type
+        of links of the feed items, so that the HEAD requests of these items do not wait for TCP and TLS handshakes
+
+        Parameters:
+            items (list): List of feed items which are not processed right away
+        """
+        hosts = {urlparse(url)[:2] for item in items for url in cls.__get_unresolved_urls(item)}
+        with cls._warmed_up_hosts_lock:
+            hosts -= cls._warmed_up_hosts
+            cls._warmed_up_hosts |= hosts
+        for scheme, host in hosts:
+            if scheme in ('http', 'https'):
+                cls._warm_up_executor.submit(cls.__warm_up_connection, f'{scheme}://{host}/')
+
+    @staticmethod
+    def __warm_up_connection(url):
+        """
+        This method sends HEAD request to the host root so that the session keeps the connection open
+
+        Parameters:
+            url (str): Link to the host root
+        """
+        try:
+            News._session.head(url, allow_redirects=False, timeout=HEAD_TIMEOUT)
+        except requests.exceptions.RequestException:
+            pass
+
+    @staticmethod
+    def __get_unresolved_urls(item) -> list:
+        """
+        This method finds the links of the feed item whose content type will have to be requested
+
+        Parameters:
+            item (bs4.element.Tag): Object of class bs4.element.Tag containing news item
+
+        Returns:
+            list: List of links without advertised or guessable content type
+        """
+        urls = [attachment['url'] for attachment in item.find_all(['enclosure', 'media:content'])
+                if not attachment.get('type')]
+        if item.description:
+            for image_tag in IMAGE_TAG_PATTERN.findall(item.description.text):
+                image_url = News.__parse_tag_attributes(image_tag).get('src')
+                if image_url and News.__guess_type(image_url) is None:
+                    urls.append(image_url)
+        return urls
 
     def __parse_description(self) -> str:
-        """This method parses the description of the feed item and formats it"""
+        """
+        This method parses the description of the feed item and formats it.
+        Descriptions that contain no markup other than images are rewritten in a single pass without building a tree
+        """
         if self.item.description:
-            document_data = BeautifulSoup(self.item.description.text, 'html.parser')
-            images = document_data.find_all('img')
-            for image in images:
-                item_position = len(self.links)
-                response = requests.head(image['url'])
-                image_type = response.headers['content-type']
-                self.links[item_position] = {'enclosure': False, 'media': False, 'type': image_type,
-                                             'url': image['src'], 'attributes': {'alt': image['alt']}}
-                image.replace_with(f'[image {item_position}{": " + image["alt"] + "] " if image["alt"] else "] "}')
-            return document_data.text
+            description = self.item.description.text
+            if NOT_IMAGE_TAG_PATTERN.search(description):
+                document_data = BeautifulSoup(description, 'lxml')
+                for image in document_data.find_all('img', src=True):
+                    image.replace_with(self.__add_image(image['src'], image.get('alt', '')))
+                return document_data.text
+            return html.unescape(IMAGE_TAG_PATTERN.sub(self.__replace_image_tag, description))
+
+    def __replace_image_tag(self, match) -> str:
+        """
+        This method adds the image from the matched <img> tag to links
+
+        Parameters:
+            match (re.Match): Match of the <img> tag in the raw description
+
+        Returns:
+            str: HTML escaped image placeholder (empty string for the image without a link)
+        """
+        attributes = self.__parse_tag_attributes(match.group(0))
+        if not attributes.get('src'):
+            return ''
+        return html.escape(self.__add_image(attributes['src'], attributes.get('alt', '')), quote=False)
+
+    @staticmethod
+    def __parse_tag_attributes(tag) -> dict:
+        """
+        This method parses attributes of the raw HTML tag
+
+        Parameters:
+            tag (str): Raw HTML tag
+
+        Returns:
+            dict: Dictionary with unescaped attribute values by lowercase attribute names
+        """
+        return {name.lower(): html.unescape(''.join(values)) for name, *values in ATTRIBUTE_PATTERN.findall(tag)}
+
+    @staticmethod
+    def __guess_type(url):
+        """
+        This method guesses the content type by the link extension or by the data URI itself
+
+        Parameters:
+            url (str): Link to content
+
+        Returns:
+            str: Content type
+            None: If the content type cannot be guessed
+        """
+        return mimetypes.guess_type(url if url.startswith('data:') else urlparse(url).path)[0]
+
+    def __add_image(self, url, alt) -> str:
+        """
+        This method adds the description image to links
+
+        Parameters:
+            url (str): Link to image
+            alt (str): Alternative text of image
+
+        Returns:
+            str: Placeholder which replaces the image in the description
+        """
+        item_position = len(self.links)
+        self.links.append({'enclosure': False, 'media': False, 'type': self.__guess_type(url),
+                           'url': url, 'attributes': {'alt': alt}})
+        return f'[image {item_position}: {alt}] ' if alt else f'[image {item_position}] '
 
     def __parse_date(self) -> datetime:
-        """This method parses the publication date of the feed item"""
+        """
+        This method parses the publication date of the feed item.
+        RFC 822 dates are parsed directly, other formats (e.g. ISO 8601 from Atom) are parsed by dateutil
+        """
         if self.item.pubDate:
             date = self.item.pubDate.text
         elif self.item.published:
             date = self.item.published.text
-        return parse(date)
+        try:
+            return parsedate_to_datetime(date)
+        except (TypeError, ValueError):
+            return parse(date)
 
     def __format_links(self) -> str:
         """This method returns the formatted links contained in the feed item"""
-        return '\n' + '\n'.join(f'[{position}] {link["url"]} ({link["type"]})' for position, link in self.links.items())
+        return '\n' + '\n'.join(
+            f'[{position}] {link["url"]} ({link["type"]})' for position, link in enumerate(self.links))
 
     def to_dict(self) -> dict:
         """This method returns a dictionary representation of the news object"""
@@ -73,65 +257,133 @@ class News:
                 'url': self.link,
                 'description': self.description,
                 'date': self.formatted_date,
-                'links': self.links if self.links else None}
+                'links': self.links or None}
+
+    @property
+    def formatted_date(self) -> str:
+        """This property formats the publication date of the feed item on first access"""
+        if self._formatted_date is None:
+            self._formatted_date = datetime.strftime(self.date, DATE_FORMAT)
+        return self._formatted_date
+
+    @formatted_date.setter
+    def formatted_date(self, formatted_date):
+        """This property setter sets the formatted publication date (e.g. retrieved from cache)"""
+        self._formatted_date = formatted_date
 
     def __str__(self) -> str:
         """This method override default __str__ method which computes the string representation of an object"""
+        if self._rendered is None:
+            self._rendered = self.__render()
+        return self._rendered
+
+    def __render(self) -> str:
+        """This method computes the string representation of the news object"""
         if self.to_colorized_format:
-            return f'[{self.colorize_string(self.feed_title, "red")}] {self.colorize_string(self.title, "yellow")}\n' \
-                   f'{self.colorize_string("Date:", "cyan")} {self.colorize_string(self.formatted_date, "yellow")}\n' \
-                   f'{self.colorize_string("Link:", "cyan")} {self.link}\n\n' \
-                   f'{self.colorize_string(self.description, "yellow") if self.description else ""}\n\n' \
-                   f'{self.colorize_string("Links:", "cyan") + self.__format_links() if self.links else ""}'.rstrip()
+            parts = ['[', self.colorize_string(self.feed_title, 'red'), '] ',
+                     self.colorize_string(self.title, 'yellow'), '\n',
+                     self.colorize_string('Date:', 'cyan'), ' ',
+                     self.colorize_string(self.formatted_date, 'yellow'), '\n',
+                     self.colorize_string('Link:', 'cyan'), ' ', self.link, '\n\n']
+            if self.description:
+                parts.append(self.colorize_string(self.description, 'yellow'))
+            parts.append('\n\n')
+            if self.links:
+                parts.extend((self.colorize_string('Links:', 'cyan'), self.__format_links()))
         else:
-            return f'[{self.feed_title}] {self.title}\n' \
-                   f'Date: {self.formatted_date}\n' \
-                   f'Link: {self.link}\n\n' \
-                   f'{self.description if self.description else ""}\n\n' \
-                   f'{"Links:" + self.__format_links() if self.links else ""}'.rstrip()
+            parts = ['[', self.feed_title, '] ', self.title, '\n',
+                     'Date: ', self.formatted_date, '\n',
+                     'Link: ', self.link, '\n\n']
+            if self.description:
+                parts.append(self.description)
+            parts.append('\n\n')
+            if self.links:
+                parts.extend(('Links:', self.__format_links()))
+        return ''.join(parts).rstrip()
 
     def __from_cache(self):
         """This method retrieves news variables from cached news"""
-        self.links = self.item['links']
+        links = self.item['links']
+        if isinstance(links, dict):
+            links = list(links.values())
+        self.links = links or []
         self.title = self.item['title']
         self.link = self.item['url']
         self.description = self.item['description']
         self.formatted_date = self.item['date']
 
-    def __parse_enclosure(self):
-        """This method parses enclosures from the feed item and adds them to links"""
-        enclosure_list = self.item.find_all('enclosure')
-        for enclosure in enclosure_list:
-            enclosure_type = self.__get_content_type(enclosure)
-            self.links[len(self.links)] = {'enclosure': True, 'media': False, 'type': enclosure_type,
-                                           'url': enclosure['url'], 'attributes': None}
-
-    def __parse_media_content(self):
-        """This method parses media:content from the feed item and adds them to links"""
-        media_content_list = self.item.findAll('media:content')
-        for media_content in media_content_list:
-            media_content_type = self.__get_content_type(media_content)
-            self.links[len(self.links)] = {'enclosure': False, 'media': True, 'type': media_content_type,
-                                           'url': media_content['url'], 'attributes': None}
+    def __parse_attachments(self):
+        """This method parses enclosures and media:content from the feed item in one pass and adds them to links"""
+        for attachment in self.item.find_all(['enclosure', 'media:content']):
+            is_enclosure = attachment.name == 'enclosure'
+            self.links.append({'enclosure': is_enclosure, 'media': not is_enclosure,
+                               'type': attachment.get('type') or None, 'url': attachment['url'], 'attributes': None})
+
+    def __resolve_content_types(self):
+        """
+        This method sends HEAD requests concurrently for the links whose content type is not advertised by the feed
+        and sets their content type
+        """
+        unresolved_links = [link for link in self.links if link['type'] is None]
+        content_type_requests = [News.__request_content_type(link['url']) for link in unresolved_links]
+        for link, content_type_request in zip(unresolved_links, content_type_requests):
+            content_type = content_type_request.result()
+            if content_type is None:
+                self.logger.debug(f'Unable to get the content type of "{link["url"]}". The HEAD request failed')
+                content_type = 'unknown'
+            link['type'] = content_type
+
+    @staticmethod
+    def __request_content_type(url) -> Future:
+        """
+        This method submits the content type lookup to the thread pool.
+        If the lookup of the same URL is already in progress (e.g. started by another news) its future is reused
+
+        Parameters:
+            url (str): Link to content
+
+        Returns:
+            concurrent.futures.Future: Future with the content type
+        """
+        with News._content_type_requests_lock:
+            content_type_request = News._content_type_requests.get(url)
+            if content_type_request is not None:
+                return content_type_request
+            content_type_request = News._executor.submit(News._head_content_type, url)
+            News._content_type_requests[url] = content_type_request
+        content_type_request.add_done_callback(lambda _: News.__forget_content_type_request(url))
+        return content_type_request
+
+    @staticmethod
+    def __forget_content_type_request(url):
+        """
+        This method removes the finished content type lookup, further lookups of the URL are served by the cache
+
+        Parameters:
+            url (str): Link to content
+        """
+        with News._content_type_requests_lock:
+            News._content_type_requests.pop(url, None)
 
     @staticmethod
-    def __get_content_type(content):
+    @lru_cache(maxsize=4096)
+    def _head_content_type(url) -> str:
         """
-        This method will determine the content type
+        This method will determine the content type by sending HEAD request to the specified URL.
+        Results are cached by URL for the lifetime of the process
 
         Parameters:
-            content (bs4.element.Tag): Object of class bs4.element.Tag with content
+            url (str): Link to content
 
         Returns:
             str: Content type
+            None: If the request failed (e.g. timeout, connection error or invalid URL)
         """
-        response = requests.head(content['url'])
-        content_type = response.headers.get('content-type')
-        if content_type is None:
-            content_type = content.get('type')
-            if content_type is None:
-                content_type = 'unknown'
-        return content_type
+        try:
+            response = News._session.head(url, allow_redirects=False, timeout=HEAD_TIMEOUT)
+        except requests.exceptions.RequestException:
+            return None
+        return response.headers.get('content-type', 'unknown')
 
     @staticmethod
     def colorize_string(string, color):
@@ -145,5 +397,7 @@ class News:
         Returns:
             str: ANSI escaped string
         """
-        colors = {'cyan': '\033[1;36m', 'yellow': '\033[1;33m', 'red': '\033[1;31m', 'reset': '\033[0m'}
-        return colors[color] + string + colors['reset']
+        return f'{News._COLORS[color]}{string}{News._COLOR_RESET}'
+
+
+atexit.register(News._session.close)
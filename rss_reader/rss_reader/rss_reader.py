@@ -20,8 +20,7 @@ def main(argv=sys.argv[1:]):
     Parameters:
         argv (list): List of command-line arguments
     """
-    parser = Parser()
-    args = parser.parse_args(argv)
+    args = build_parser().parse_args(argv)
     log_handler = logging.StreamHandler()
     if args.verbose:
         logging.root.setLevel(logging.INFO)
@@ -45,24 +44,46 @@ def main(argv=sys.argv[1:]):
         for feed in feeds_list:
             print(feed)
     elif args.source:
-        document_data = get_data_from_url(logger, args.source)
-        if document_data:
-            feed_title = document_data.find('title').text
-            items = document_data.find_all('item')
-            logger.info(f'Founded {len(items)} news items')
-            if items:
-                feed = Feed(args.source, args.limit, args.json, args.colorize, logger, feed_title, cache,
-                            news_items=items)
-                if args.to_pdf is not None:
-                    converter.to_pdf(args.to_pdf, [feed], args.limit)
-                if args.to_html is not None:
-                    converter.to_html([feed], args.limit, path=args.to_html)
-                print(feed)
+        feed = None
+        response = get_response_from_url(logger, args.source, cache.get_feed_validators(args.source))
+        if response is not None and response.status_code == 304:
+            logger.info('Feed has not been modified since the last request')
+            feed = cache.get_cached_feed(args.source, args.limit, args.json, args.colorize)
+            if feed is None:
+                logger.info('Cached news of the feed not found. Requesting the feed again')
+                response = get_response_from_url(logger, args.source)
+        if feed is None and response is not None:
+            document_data = get_rss_from_response(logger, response)
+            if document_data:
+                feed_title = document_data.find('title').text
+                items = document_data.find_all('item')
+                logger.info(f'Founded {len(items)} news items')
+                if items:
+                    feed = Feed(args.source, args.limit, args.json, args.colorize, logger, feed_title, cache,
+                                news_items=items)
+                    cache.flush()
+                    cache.cache_feed(feed, response.headers)
+        if feed is not None:
+            if args.to_pdf is not None:
+                converter.to_pdf(args.to_pdf, [feed], args.limit)
+            if args.to_html is not None:
+                converter.to_html([feed], args.limit, path=args.to_html)
+            print(feed)
             logger.info('Successfully completed')
     else:
         logger.error('Source URL not specified. Please check your input and try again')
 
 
+def build_parser():
+    """
+    This function creates the command-line arguments parser
+
+    Returns:
+        Parser: Object of class Parser
+    """
+    return Parser()
+
+
 def get_data_from_url(logger, source_url):
     """
     This function parsing RSS from specified URL
@@ -75,21 +96,53 @@ def get_data_from_url(logger, source_url):
         bs4.BeautifulSoup: Object of class bs4.BeautifulSoup containing parsed RSS feed
         None: If specified URL does not contain RSS, invalid URL or connection error
     """
+    response = get_response_from_url(logger, source_url)
+    if response is not None:
+        return get_rss_from_response(logger, response)
+    return None
+
+
+def get_response_from_url(logger, source_url, headers=None):
+    """
+    This function sends GET request to the specified URL
+
+    Parameters:
+        logger (module): logging module
+        source_url (str): Link to RSS Feed
+        headers (dict or NoneType): Additional request headers (e.g. conditional request headers)
+
+    Returns:
+        requests.Response: Response to GET request
+        None: If invalid URL or connection error
+    """
     try:
         logger.info('Sending GET request to the specified URL')
-        response = requests.get(source_url)
+        return requests.get(source_url, headers=headers)
     except requests.exceptions.ConnectionError:
         logger.error('An error occurred while sending a GET request to the specified URL. Check the specified URL'
                      ' and your internet connection')
     except requests.exceptions.MissingSchema:
         logger.error(f'Invalid URL "{source_url}". The specified URL should look like "http://www.example.com/"')
-    else:
-        logger.info('Parsing XML from the specified URL')
-        document_data = BeautifulSoup(response.content, 'lxml-xml')
-        if document_data.find('rss'):
-            return document_data
-        else:
-            logger.error('Specified URL does not contain RSS. Please check the specified URL and try again')
+    return None
+
+
+def get_rss_from_response(logger, response):
+    """
+    This function parsing RSS from the response
+
+    Parameters:
+        logger (module): logging module
+        response (requests.Response): Response to GET request
+
+    Returns:
+        bs4.BeautifulSoup: Object of class bs4.BeautifulSoup containing parsed RSS feed
+        None: If the response does not contain RSS
+    """
+    logger.info('Parsing XML from the specified URL')
+    document_data = BeautifulSoup(response.content, 'lxml-xml')
+    if document_data.find('rss'):
+        return document_data
+    logger.error('Specified URL does not contain RSS. Please check the specified URL and try again')
     return None
 
 
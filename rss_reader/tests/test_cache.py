@@ -1,6 +1,10 @@
 import filecmp
+from io import StringIO
+import os
+from unittest.mock import patch
 
-from rss_reader.tests.testing import BaseTest
+from rss_reader.rss_reader import rss_reader
+from rss_reader.tests.testing import BaseTest, mock_response
 
 
 class TestRssReader(BaseTest):
@@ -40,3 +44,52 @@ class TestRssReader(BaseTest):
         with open(self.data_folder + 'result_json_2.json', 'r') as file:
             json_data = file.read()
         self.assertEqual(str(feeds_list[0]), json_data)
+
+    def test_deferred_cache_news(self):
+        """Tests that deferred news are written to a file only on flush"""
+        for example_news in self.example_news_list:
+            self.cache.cache_news(example_news, defer=True)
+        self.assertFalse(os.path.exists(self.cache_folder + '20210505.json'))
+        self.cache.flush()
+        feeds_list = self.cache.get_news_from_cache('20210505', None, None, False, False)
+        self.assertEqual([news.to_dict() for news in feeds_list[0].news_list],
+                         [news.to_dict() for news in self.example_news_list])
+
+    def test_cache_feed(self):
+        """Tests that the feed is cached together with the response validators and can be restored"""
+        self.cache.cache_feed(self.example_feed, {'ETag': '"5f9b"', 'Last-Modified': 'Wed, 05 May 2021 19:51:05 GMT'})
+        self.assertEqual(self.cache.get_feed_validators('https://www.yahoo.com/news'),
+                         {'If-None-Match': '"5f9b"', 'If-Modified-Since': 'Wed, 05 May 2021 19:51:05 GMT'})
+        feed = self.cache.get_cached_feed('https://www.yahoo.com/news', None, False, False)
+        self.assertEqual([news.to_dict() for news in feed.news_list],
+                         [news.to_dict() for news in self.example_news_list])
+
+    def test_cache_feed_without_validators(self):
+        """Tests that the feed is not cached if the response has no validators"""
+        self.cache.cache_feed(self.example_feed, {})
+        self.assertEqual(self.cache.get_feed_validators('https://www.yahoo.com/news'), {})
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('requests.get')
+    def test_not_modified_feed(self, mock_get, mock_stdout):
+        """Tests that if the feed has not been modified the news saved with it are printed"""
+        self.cache.cache_feed(self.example_feed, {'ETag': '"5f9b"'})
+        mock_get.return_value = mock_response(304, b'')
+        with patch('rss_reader.rss_reader.rss_reader.Cache', return_value=self.cache):
+            rss_reader.main(['https://www.yahoo.com/news', '--limit=2'])
+        mock_get.assert_called_once_with('https://www.yahoo.com/news', headers={'If-None-Match': '"5f9b"'})
+        self.assertEqual(mock_stdout.getvalue(),
+                         '\n\n'.join(str(news) for news in self.example_news_list[:2]) + '\n')
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('requests.get')
+    def test_not_modified_feed_without_cached_news(self, mock_get, mock_stdout):
+        """Tests that if the feed has not been modified but its news were not saved the feed is requested again"""
+        with open(self.data_folder + 'example.xml', 'r') as file:
+            document_content = file.read()
+        mock_get.side_effect = [mock_response(304, b''), mock_response(200, document_content)]
+        with patch('rss_reader.rss_reader.rss_reader.Cache', return_value=self.cache):
+            rss_reader.main(['https://www.yahoo.com/news'])
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_stdout.getvalue(),
+                         '\n\n'.join(str(news) for news in self.example_news_list) + '\n')
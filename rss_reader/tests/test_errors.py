@@ -1,7 +1,7 @@
-import argparse
 from io import StringIO
 import logging
 import os
+import socket
 import unittest
 from unittest.mock import patch
 
@@ -13,7 +13,8 @@ from rss_reader.tests.testing import mock_response
 
 @ddt.ddt
 class TestRssReader(unittest.TestCase):
-    def test_wrong_url(self):
+    @patch('socket.getaddrinfo', side_effect=socket.gaierror)
+    def test_wrong_url(self, mock_getaddrinfo):
         """Tests that if specified invalid URL app should print error"""
         argv = ['https://pagethatdoesnexist.error/']
         with self.assertLogs('root', level='ERROR') as cm:
@@ -25,19 +26,17 @@ class TestRssReader(unittest.TestCase):
     @patch('sys.stderr', new_callable=StringIO)
     def test_negative_limit(self, mock_stderr):
         """Tests that if --limit option is negative app should print error"""
-        argv = ['https://news.yahoo.com/rss/', '--limit=-1']
+        argv = ['http://x/', '--limit=-1']
         with self.assertRaises(SystemExit):
-            with self.assertRaises(argparse.ArgumentTypeError):
-                rss_reader.main(argv)
+            rss_reader.build_parser().parse_args(argv)
         self.assertIn('The limit argument must be greater than zero (-1 was passed)', mock_stderr.getvalue())
 
     @patch('sys.stderr', new_callable=StringIO)
     def test_zero_limit(self, mock_stderr):
         """Tests that if --limit option is zero app should print error"""
-        argv = ['https://news.yahoo.com/rss/', '--limit=0']
+        argv = ['http://x/', '--limit=0']
         with self.assertRaises(SystemExit):
-            with self.assertRaises(argparse.ArgumentTypeError):
-                rss_reader.main(argv)
+            rss_reader.build_parser().parse_args(argv)
         self.assertIn('The limit argument must be greater than zero (0 was passed)', mock_stderr.getvalue())
 
     def test_url_has_no_schema_supplied(self):
@@ -67,25 +66,16 @@ class TestRssReader(unittest.TestCase):
             rss_reader.main(argv)
         self.assertIn('ERROR:root:Source URL not specified. Please check your input and try again', cm.output)
 
-    @ddt.data('123', 'date', '123456789')
-    def test_wrong_date_format(self, date_value):
-        """Tests that if specified date doesn't match the format app should print error"""
+    @ddt.data('123', 'date', '123456789', '20211301', '20210001', '20210132', '20210100')
+    def test_wrong_date(self, date_value):
+        """
+        Tests that if specified date doesn't match the format or contains a nonexistent month or day
+        app should print error
+        """
         with patch('sys.stderr', new_callable=StringIO) as mock_stderr:
-            argv = ['https://news.yahoo.com/rss/', f'--date={date_value}']
+            argv = ['http://x/', f'--date={date_value}']
             with self.assertRaises(SystemExit):
-                with self.assertRaises(argparse.ArgumentTypeError):
-                    rss_reader.main(argv)
-            self.assertIn(f'Invalid date "{date_value}". The specified date does not match the format "%Y%m%d"',
-                          mock_stderr.getvalue())
-
-    @ddt.data('20211301', '20210001', '20210132', '20210100')
-    def test_nonexistent_dates(self, date_value):
-        """Tests that if specified date contains a nonexistent month or day app should print error"""
-        with patch('sys.stderr', new_callable=StringIO) as mock_stderr:
-            argv = ['https://news.yahoo.com/rss/', f'--date={date_value}']
-            with self.assertRaises(SystemExit):
-                with self.assertRaises(argparse.ArgumentTypeError):
-                    rss_reader.main(argv)
+                rss_reader.build_parser().parse_args(argv)
             self.assertIn(f'Invalid date "{date_value}". The specified date does not match the format "%Y%m%d"',
                           mock_stderr.getvalue())
 
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+import logging
+import os
+import unittest
+from unittest.mock import Mock, patch
+
+from bs4 import BeautifulSoup
+import requests
+
+from components.news import News
+
+
+class TestNews(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """This method initializes variables used in tests"""
+        cls.data_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), 'data')) + os.path.sep
+        with open(cls.data_folder + 'example_with_links.xml', 'r') as file:
+            cls.example_item, cls.example_item_with_images = BeautifulSoup(file.read(), 'lxml-xml').find_all('item')
+
+    def setUp(self):
+        """This method clears the content type cache before each test"""
+        News._head_content_type.cache_clear()
+        News._warmed_up_hosts.clear()
+
+    @patch.object(News._session, 'head')
+    def test_head_requests_only_for_unknown_types(self, mock_head):
+        """Tests that HEAD requests are sent only for links whose content type is not advertised or guessable"""
+        mock_head.return_value = Mock(headers={'content-type': 'image/png'})
+        news = News('Example feed with links', self.example_item, 'https://www.example.com/news', logging, Mock(),
+                    False)
+        requested_urls = sorted(call.args[0] for call in mock_head.call_args_list)
+        self.assertEqual(requested_urls, ['https://img.example.com/2', 'https://media.example.com/2'])
+        self.assertEqual([link['type'] for link in news.links],
+                         ['image/jpeg', 'image/png', 'audio/mpeg', 'image/png', 'image/jpeg'])
+
+    @patch.object(News._session, 'head')
+    def test_content_type_is_requested_once_per_url(self, mock_head):
+        """Tests that the content type of the same URL is requested only once"""
+        mock_head.return_value = Mock(headers={'content-type': 'image/png'})
+        for _ in range(2):
+            News('Example feed with links', self.example_item, 'https://www.example.com/news', logging, Mock(),
+                 False)
+        self.assertEqual(mock_head.call_count, 2)
+
+    @patch.object(News._session, 'head')
+    def test_rfc_822_date(self, mock_head):
+        """Tests that the RFC 822 publication date is parsed with its time zone"""
+        mock_head.return_value = Mock(headers={})
+        news = News('Example feed with links', self.example_item, 'https://www.example.com/news', logging, Mock(),
+                    False)
+        self.assertEqual(news.date, datetime(2021, 5, 5, 15, 51, 5, tzinfo=timezone(timedelta(hours=-4))))
+        self.assertEqual(news.formatted_date, 'Wed, 05 May 2021 15:51:05')
+
+    @patch.object(News._session, 'head')
+    def test_unreachable_content(self, mock_head):
+        """Tests that if the content server does not respond the content type is unknown"""
+        mock_head.side_effect = requests.exceptions.ConnectTimeout
+        news = News('Example feed with links', self.example_item, 'https://www.example.com/news', logging, Mock(),
+                    False)
+        self.assertEqual(news.links[1]['type'], 'unknown')
+        self.assertEqual(news.links[3]['type'], 'unknown')
+
+    def test_legacy_cached_links(self):
+        """Tests that links cached as a dictionary are converted to a list"""
+        cached_news = {'title': 'News with links', 'url': 'https://www.example.com/news/1.html', 'description': None,
+                       'date': 'Wed, 05 May 2021 15:51:05',
+                       'links': {'0': {'enclosure': True, 'media': False, 'type': 'audio/mpeg',
+                                       'url': 'https://media.example.com/1.mp3', 'attributes': None}}}
+        news = News('Example feed with links', cached_news, 'https://www.example.com/news', logging, Mock(), False)
+        self.assertEqual(news.links, [cached_news['links']['0']])
+
+    def test_description_with_images(self):
+        """Tests that images are replaced with placeholders in a description without other markup"""
+        news = News('Example feed with links', self.example_item_with_images, 'https://www.example.com/news', logging,
+                    Mock(), False)
+        self.assertEqual(news.description,
+                         'Tom & Jerry [image 0: Tom & Jerry] \n                [image 1] \n            ')
+        self.assertEqual(news.links, [
+            {'enclosure': False, 'media': False, 'type': 'image/png', 'url': 'https://img.example.com/3.png',
+             'attributes': {'alt': 'Tom & Jerry'}},
+            {'enclosure': False, 'media': False, 'type': 'image/gif', 'url': 'https://img.example.com/4.gif',
+             'attributes': {'alt': ''}}])
+
+    def test_invalid_image_urls(self):
+        """
+        Tests that images with data URI, relative links or without links do not prevent the news from being created
+        """
+        for description in ('{}', '&lt;p&gt;{}&lt;/p&gt;'):
+            item = BeautifulSoup('<item><title>Title</title><link>https://www.example.com/news/3.html</link>'
+                                 '<description>' + description.format(
+                                     '&lt;img src="data:image/png;base64,iVBORw0KGgo=" alt="Dot"&gt;'
+                                     '&lt;img data-src="https://img.example.com/lazy.jpg" alt="No link"&gt;'
+                                     '&lt;img src="/images/logo" alt="Logo"&gt;') + '</description>'
+                                 '<pubDate>Wed, 05 May 2021 15:51:05 -0400</pubDate></item>', 'lxml-xml').find('item')
+            news = News('Example feed with links', item, 'https://www.example.com/news', logging, Mock(), False)
+            self.assertEqual([link['type'] for link in news.links], ['image/png', 'unknown'])
+            self.assertEqual(news.description, '[image 0: Dot] [image 1: Logo] ')
+
+    @patch.object(News, '_warm_up_executor')
+    @patch.object(News._session, 'head')
+    def test_warm_up_connections(self, mock_head, mock_warm_up_executor):
+        """Tests that connections to the hosts of items that wait for a worker are opened in the background"""
+        mock_head.return_value = Mock(headers={'content-type': 'image/png'})
+        news_list = News.build_many('Example feed with links', [self.example_item] * 9, 'https://www.example.com/news',
+                                    logging, Mock(), False)
+        self.assertEqual(len(news_list), 9)
+        warmed_up_urls = sorted(call.args[1] for call in mock_warm_up_executor.submit.call_args_list)
+        self.assertEqual(warmed_up_urls, ['https://img.example.com/', 'https://media.example.com/'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,10 +39,11 @@ class BaseTest(unittest.TestCase):
         shutil.rmtree(self.cache_folder)
 
 
-def mock_response(status, content):
+def mock_response(status, content, headers=None):
     """Function that simulate the response from requests.get"""
     mock_response = unittest.mock.Mock()
     mock_response.raise_for_status = unittest.mock.Mock()
     mock_response.status_code = status
     mock_response.content = content
+    mock_response.headers = headers or {}
     return mock_response